@@ -24,31 +24,37 @@
 
 """
 
+from functools import lru_cache
 from os import sep as separator
-from os.path import (
-    join as path_join,
-    dirname
-)
-CONFIG_DIR = path_join(dirname(__file__), 'config')
+from os.path import dirname
+from pathlib import PurePosixPath
 APP_CONFIG_NAME = 'application_core_config.yaml'
 DEPLOY_SCRIPT_NAME = 'deploy_application_to_node.py'
-SCRIPT_DIR_PATH = path_join(
-    dirname(__file__),
-    'scripts',
-)
+_PACKAGE_DIR = dirname(__file__)
+CONFIG_DIR = f"{_PACKAGE_DIR}{separator}config"
+SCRIPT_DIR_PATH = f"{_PACKAGE_DIR}{separator}scripts"
+# Remote hosts are always POSIX, regardless of where this code runs.
+_REMOTE_HOME = PurePosixPath("/root")
 
 
+@lru_cache(maxsize=None)
 def script(filename):
     """Translate a file name into a full path name to a file in the
     scripts directory.
 
     """
-    return path_join(SCRIPT_DIR_PATH, filename)
+    return SCRIPT_DIR_PATH + separator + filename
 
 
+@lru_cache(maxsize=None)
 def home(filename):
     """Translate a filename into a full path on a remote host that is
     in the 'root' home directory.
 
     """
-    return path_join(separator, "root", filename)
+    return str(_REMOTE_HOME / filename)
+
+
+# Full path to the node deployment script, resolved once so callers
+# building deploy manifests don't have to redo it.
+DEPLOY_SCRIPT_PATH = script(DEPLOY_SCRIPT_NAME)
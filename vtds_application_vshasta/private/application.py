@@ -23,9 +23,14 @@
 """Private layer implementation module for the vshasta application.
 
 """
-import os
 from os.path import join as path_join
-from yaml import safe_dump
+from shlex import quote
+from yaml import dump as yaml_dump
+try:
+    # Prefer the libyaml based emitter when PyYAML was built with it.
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 from vtds_base import (
     ContextualError,
@@ -35,10 +40,16 @@ from vtds_base.layers.application import ApplicationAPI
 from . import (
     APP_CONFIG_NAME,
     DEPLOY_SCRIPT_NAME,
-    script,
+    DEPLOY_SCRIPT_PATH,
     home
 )
 
+# The parts of the deploy manifests that don't depend on the build
+# directory or the stack, computed once here instead of per manifest.
+DEPLOY_SCRIPT_HOME = home(DEPLOY_SCRIPT_NAME)
+APP_CONFIG_HOME = home(APP_CONFIG_NAME)
+DEPLOY_SCRIPT_FILE = (DEPLOY_SCRIPT_PATH, DEPLOY_SCRIPT_HOME, 'node-deploy')
+
 
 class Application(ApplicationAPI):
     """PrivateApplication class, implements the vshasta application layer
@@ -71,28 +82,20 @@ class Application(ApplicationAPI):
             'type': 'node',
             'class_names': ['pit_node'],
             'files': [
-                (
-                    script(DEPLOY_SCRIPT_NAME),
-                    home(DEPLOY_SCRIPT_NAME),
-                    'node-deploy'
-                ),
-                (self.app_config_path, home(APP_CONFIG_NAME), 'config'),
+                DEPLOY_SCRIPT_FILE,
+                (self.app_config_path, APP_CONFIG_HOME, 'config'),
             ],
-            'script': path_join(os.sep, 'root', DEPLOY_SCRIPT_NAME),
+            'script': DEPLOY_SCRIPT_HOME,
         }
         virtual_blades = self.stack.get_provider_api().get_virtual_blades()
         blade_manifest = {
             'type': 'blade',
             'class_names': virtual_blades.blade_classes(),
             'files': [
-                (
-                    script(DEPLOY_SCRIPT_NAME),
-                    home(DEPLOY_SCRIPT_NAME),
-                    'node-deploy'
-                ),
-                (self.app_config_path, home(APP_CONFIG_NAME), 'config'),
+                DEPLOY_SCRIPT_FILE,
+                (self.app_config_path, APP_CONFIG_HOME, 'config'),
             ],
-            'script': path_join(os.sep, 'root', DEPLOY_SCRIPT_NAME),
+            'script': DEPLOY_SCRIPT_HOME,
         }
         return [
             pit_node_manifest,
@@ -106,19 +109,21 @@ class Application(ApplicationAPI):
 
         """
         virtual_nodes = self.stack.get_cluster_api().get_virtual_nodes()
-        return {
-            virtual_nodes.node_hostname(
-                node_class, instance, network_name
-            ): virtual_nodes.node_ipv4_addr(
-                node_class, instance, network_name
-            )
-            for node_class, networks in node_to_network_map.items()
-            for network_name in networks
-            for instance in range(0, virtual_nodes.node_count(node_class))
-            if virtual_nodes.node_ipv4_addr(
-                node_class, instance, network_name
-            ) is not None
-        }
+        host_ip_map = {}
+        for node_class, networks in node_to_network_map.items():
+            node_count = virtual_nodes.node_count(node_class)
+            for network_name in networks:
+                for instance in range(node_count):
+                    ipv4_addr = virtual_nodes.node_ipv4_addr(
+                        node_class, instance, network_name
+                    )
+                    if ipv4_addr is None:
+                        continue
+                    hostname = virtual_nodes.node_hostname(
+                        node_class, instance, network_name
+                    )
+                    host_ip_map[hostname] = ipv4_addr
+        return host_ip_map
 
     @staticmethod
     def __deploy_manifest(connections, manifest):
@@ -149,11 +154,8 @@ class Application(ApplicationAPI):
                 )
             )
         cmd = (
-            "chmod 755 %s;" % deploy_script +
-            "python3 " +
-            "%s " % deploy_script +
-            class_name_template +
-            home(APP_CONFIG_NAME)
+            f"python3 {quote(deploy_script)} "
+            f"{class_name_template}{quote(APP_CONFIG_HOME)}"
         )
         info_msg(
             "running '%s' on Virtual %ss of types %s" %
@@ -173,8 +175,10 @@ class Application(ApplicationAPI):
             for node_class in node_classes
         }
         self.config['host_ipv4_map'] = self.__make_host_ip_map(cluster_nets)
-        with open(self.app_config_path, 'w', encoding='UTF-8') as conf:
-            safe_dump(self.config, stream=conf)
+        with open(self.app_config_path, 'wb') as conf:
+            yaml_dump(
+                self.config, stream=conf, Dumper=SafeDumper, encoding='UTF-8'
+            )
         self.prepared = True
 
     def validate(self):
@@ -33,11 +33,19 @@ from subprocess import (
     TimeoutExpired
 )
 import yaml
+try:
+    # Prefer the libyaml based parser when PyYAML was built with it.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 
 VENV_PATH = path_join(os.sep, "root", "venv")
 REQUIREMENTS_PATH = path_join(os.sep, "root", "requirements.txt")
 PYTHON = path_join(VENV_PATH, "bin", "python3")
+# Seconds to wait for a timed out command to exit after asking it to
+# terminate before killing it.
+TERMINATE_GRACE = 5
 
 
 class ContextualError(Exception):
@@ -107,36 +115,32 @@ def run_cmd(cmd, args, stdin=sys.stdin, check=True, timeout=None):
 
     """
     exitval = 0
+    signaled = False
     try:
         with Popen(
                 [cmd, *args],
                 stdin=stdin, stdout=sys.stdout, stderr=sys.stderr
         ) as command:
-            time = 0
-            signaled = False
-            while True:
+            try:
+                exitval = command.wait(timeout=timeout or None)
+            except TimeoutExpired:
+                # First try to terminate the process, then kill it if
+                # it doesn't go away within a grace period.
+                signaled = True
+                command.terminate()
                 try:
-                    exitval = command.wait(timeout=5)
+                    exitval = command.wait(timeout=TERMINATE_GRACE)
                 except TimeoutExpired:
-                    time += 5
-                    if timeout and time > timeout:
-                        if not signaled:
-                            # First try to terminate the process
-                            command.terminate()
-                            continue
-                        command.kill()
-                        print()
-                        # pylint: disable=raise-missing-from
-                        raise ContextualError(
-                            "'%s' timed out and did not terminate "
-                            "as expected after %d seconds" % (
-                                " ".join([cmd, *args]),
-                                time
-                            )
+                    command.kill()
+                    print()
+                    # pylint: disable=raise-missing-from
+                    raise ContextualError(
+                        "'%s' timed out and did not terminate "
+                        "as expected after %d seconds" % (
+                            " ".join([cmd, *args]),
+                            timeout + TERMINATE_GRACE
                         )
-                    continue
-                # Didn't time out, so the wait is done.
-                break
+                    )
             print()
     except OSError as err:
         raise ContextualError(
@@ -162,7 +166,7 @@ def read_config(config_file):
     """
     try:
         with open(config_file, 'r', encoding='UTF-8') as config:
-            return yaml.safe_load(config)
+            return yaml.load(config, Loader=SafeLoader)
     except OSError as err:
         raise ContextualError(
             "failed to load blade configuration file '%s' - %s" % (
@@ -178,10 +182,14 @@ def add_hosts(config):
 
     """
     host_map = config.get('host_ipv4_map', {})
+    entries = "".join(
+        "%-15.15s %s\n" % (ipaddr, alias)
+        for alias, ipaddr in host_map.items()
+    )
     with open("/etc/hosts", 'a', encoding='UTF-8') as hosts:
-        hosts.write("# Added by vTDS Application Layer Deployment\n")
-        for alias, ipaddr in host_map.items():
-            hosts.write("%-15.15s %s\n" % (ipaddr, alias))
+        hosts.write(
+            "# Added by vTDS Application Layer Deployment\n" + entries
+        )
 
 
 def install_deb_packages(config):
@@ -190,6 +198,10 @@ def install_deb_packages(config):
 
     """
     packages = config.get('debian_packages', [])
+    if not packages:
+        # Nothing to install, so don't bother refreshing the package
+        # lists either.
+        return
     run_cmd('apt', ['update'])
     run_cmd('apt', ['install', '-y', *packages])
 